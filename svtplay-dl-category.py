@@ -19,20 +19,46 @@ Usage examples:
 """
 
 import argparse
+import atexit
+import base64
+import gzip
+import hashlib
+import http.client
 import json
 import os
 import re
+import shutil
 import signal
+import socket
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
-from html.parser import HTMLParser
-from urllib.parse import urljoin, urlparse
-from urllib.request import Request, urlopen
+from html import unescape
+from urllib.error import HTTPError
+from urllib.parse import unquote, urljoin, urlparse
+from urllib.request import getproxies, proxy_bypass
+
+try:
+    import orjson
+except ImportError:  # optional; falls back to the json module
+    orjson = None
 
 DEFAULT_CATEGORY_URL = "https://www.svtplay.se/kategori/filmer?tab=all"
-INFO_SEARCH_EXPR = r'<script\s+id="__NEXT_DATA__"[^>]*>({.+})</script>'
+NEXT_DATA_MARKER = 'id="__NEXT_DATA__"'
+_SANITIZE_RE = re.compile(r'[<>:"/\\|?*]')
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+def _json_dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
 
 # ---------------------------------------------------------------------------
 # Graceful stop
@@ -40,6 +66,14 @@ INFO_SEARCH_EXPR = r'<script\s+id="__NEXT_DATA__"[^>]*>({.+})</script>'
 
 stop_requested = False
 current_child: subprocess.Popen | None = None
+# Prefetch / poster pools, cancelled on force quit
+background_pools: list[ThreadPoolExecutor] = []
+
+
+def _abort_background_work():
+    for pool in background_pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+    close_connections()
 
 
 def _signal_handler(signum, frame):
@@ -48,6 +82,11 @@ def _signal_handler(signum, frame):
         print("\nForce quit!", file=sys.stderr)
         if current_child is not None:
             current_child.terminate()
+        # Otherwise interpreter exit waits for queued fetches. Run it in a
+        # thread since the main thread may be holding a pool lock here.
+        t = threading.Thread(target=_abort_background_work, daemon=True)
+        t.start()
+        t.join(1.0)
         sys.exit(1)
     print("\nGraceful stop requested. Finishing current download...",
           file=sys.stderr)
@@ -74,52 +113,314 @@ _HTTP_HEADERS = {
 }
 
 
-def fetch_html(url: str, timeout: int = 30) -> str:
-    req = Request(url, headers=_HTTP_HEADERS)
-    with urlopen(req, timeout=timeout) as resp:
-        charset = resp.headers.get_content_charset() or "utf-8"
-        return resp.read().decode(charset, errors="replace")
+_MAX_REDIRECTS = 5
+
+# Keep-alive connections, one per (scheme, host) and thread. Each value is
+# (conn, proxy_headers); proxy_headers is None unless plain HTTP goes
+# through a proxy, which needs absolute request targets.
+_conn_local = threading.local()
+# Every connection of every thread, so close_connections() can reach them
+_all_conns: set[http.client.HTTPConnection] = set()
+_all_conns_lock = threading.Lock()
+
+
+def _new_connection(scheme: str, host: str, timeout: float):
+    """Open a connection honouring http_proxy / https_proxy / no_proxy."""
+    cls = (http.client.HTTPSConnection if scheme == "https"
+           else http.client.HTTPConnection)
+    proxy = getproxies().get(scheme)
+    if not proxy or proxy_bypass(host):
+        return cls(host, timeout=timeout), None
+
+    pp = urlparse(proxy if "://" in proxy else f"http://{proxy}")
+    proxy_headers = {}
+    if pp.username:
+        cred = f"{unquote(pp.username)}:{unquote(pp.password or '')}"
+        proxy_headers["Proxy-Authorization"] = (
+            "Basic " + base64.b64encode(cred.encode()).decode("ascii"))
+    conn = cls(pp.hostname, pp.port or 80, timeout=timeout)
+    if scheme == "https":
+        conn.set_tunnel(host, headers=proxy_headers)
+        return conn, None
+    return conn, proxy_headers
+
+
+def _get_connection(scheme: str, host: str, timeout: float):
+    conns = getattr(_conn_local, "conns", None)
+    if conns is None:
+        conns = _conn_local.conns = {}
+    entry = conns.get((scheme, host))
+    if entry is None:
+        entry = conns[(scheme, host)] = _new_connection(scheme, host,
+                                                        timeout)
+    else:
+        conn = entry[0]
+        conn.timeout = timeout
+        if conn.sock is not None:
+            conn.sock.settimeout(timeout)
+    with _all_conns_lock:
+        _all_conns.add(entry[0])
+    return entry
+
+
+def close_connections() -> None:
+    """Close all kept-alive connections, aborting any in-flight request."""
+    with _all_conns_lock:
+        conns = list(_all_conns)
+        _all_conns.clear()
+    for conn in conns:
+        sock = conn.sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        conn.close()
+
+
+def _send_get(url: str, headers: dict, timeout: float):
+    p = urlparse(url)
+    target = (p.path or "/") + (f"?{p.query}" if p.query else "")
+    conn, proxy_headers = _get_connection(p.scheme, p.netloc, timeout)
+    if proxy_headers is not None:
+        target = url.split("#", 1)[0]
+        headers = {**headers, **proxy_headers}
+    reused = conn.sock is not None
+    try:
+        conn.request("GET", target, headers=headers)
+        return conn, conn.getresponse()
+    except (http.client.HTTPException, ConnectionError):
+        # The server may have dropped the idle connection; retry once
+        conn.close()
+        if not reused:
+            raise
+    except BaseException:
+        # e.g. a timeout; a late response must not reach the next request
+        conn.close()
+        raise
+    try:
+        conn.request("GET", target, headers=headers)
+        return conn, conn.getresponse()
+    except BaseException:
+        conn.close()
+        raise
+
+
+@contextmanager
+def _http_get(url: str, headers: dict, timeout: float):
+    """GET url over a reused connection, following redirects."""
+    for _ in range(_MAX_REDIRECTS + 1):
+        conn, resp = _send_get(url, headers, timeout)
+        location = resp.getheader("Location")
+        if resp.status in (301, 302, 303, 307, 308) and location:
+            resp.read()
+            url = urljoin(url, location)
+            continue
+        break
+    else:
+        conn.close()
+        raise HTTPError(url, resp.status, "Too many redirects",
+                        resp.headers, None)
+
+    if resp.status >= 400:
+        resp.read()
+        raise HTTPError(url, resp.status, resp.reason, resp.headers, None)
+    try:
+        yield resp
+    finally:
+        # A partially read body would corrupt the next request
+        if not resp.isclosed():
+            conn.close()
+
+
+# Names PageCache writes: bodies and their in-progress temp files
+_CACHE_BODY_RE = re.compile(r"[0-9a-f]{64}\.html\.gz(\.\d+\.tmp)?")
+
+
+class PageCache:
+    """On-disk HTML cache revalidated with If-None-Match / If-Modified-Since.
+
+    index.json maps url -> {etag, last_modified, html_sha256, mtime}; the
+    bodies are stored next to it as <html_sha256>.html.gz. mtime is when
+    the entry was last stored or revalidated. A read-only cache (dry runs)
+    is used for lookups but never written.
+    """
+
+    def __init__(self, cache_dir: str, read_only: bool = False):
+        self.cache_dir = cache_dir
+        self.read_only = read_only
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.index = load_json_state(self.index_path)
+        self._touched: set[str] = set()
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _body_path(self, sha: str) -> str:
+        return os.path.join(self.cache_dir, f"{sha}.html.gz")
+
+    def conditional_headers(self, url: str) -> dict:
+        with self._lock:
+            entry = self.index.get(url)
+        if not entry or not os.path.exists(
+                self._body_path(entry["html_sha256"])):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load(self, url: str) -> str | None:
+        with self._lock:
+            entry = self.index.get(url)
+        if not entry:
+            return None
+        try:
+            with gzip.open(self._body_path(entry["html_sha256"]), "rt",
+                           encoding="utf-8") as f:
+                html = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            entry["mtime"] = time.time()
+            self._touched.add(url)
+            self._dirty = True
+        return html
+
+    def store(self, url: str, html: str, etag: str | None,
+              last_modified: str | None) -> None:
+        if self.read_only or (not etag and not last_modified):
+            return
+        data = html.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        path = self._body_path(sha)
+        if not os.path.exists(path):
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp, "wb", compresslevel=3) as f:
+                f.write(data)
+            os.replace(tmp, path)
+        # A replaced body may still be shared by another URL; prune()
+        # removes it once nothing references it
+        with self._lock:
+            self.index[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "html_sha256": sha,
+                "mtime": time.time(),
+            }
+            self._touched.add(url)
+            self._dirty = True
+
+    def prune(self, max_age_days: int = 30,
+              drop_untouched: bool = False) -> None:
+        """Drop stale entries and any body file the index no longer uses.
+
+        Entries older than max_age_days always go; with drop_untouched,
+        so does every entry not stored or revalidated during this run.
+        """
+        if self.read_only:
+            return
+        cutoff = time.time() - max_age_days * 86400
+        with self._lock:
+            for url in list(self.index):
+                entry = self.index[url]
+                if ((drop_untouched and url not in self._touched)
+                        or entry.get("mtime", 0) < cutoff):
+                    del self.index[url]
+                    self._dirty = True
+            keep = {f"{e['html_sha256']}.html.gz"
+                    for e in self.index.values()}
+        # Only touch files the cache wrote; --cache-dir may be shared.
+        # Bodies stored before a force quit may never have been indexed.
+        for name in os.listdir(self.cache_dir):
+            if ((_CACHE_BODY_RE.fullmatch(name) and name not in keep)
+                    or name == "index.json.tmp"):
+                os.remove(os.path.join(self.cache_dir, name))
+
+    def save(self) -> None:
+        with self._lock:
+            if self.read_only or not self._dirty:
+                return
+            save_json_state(self.index_path, dict(self.index))
+            self._dirty = False
+
+
+def fetch_html(url: str, timeout: int = 30,
+               cache: PageCache | None = None) -> str:
+    headers = _HTTP_HEADERS
+    if cache is not None:
+        headers = {**_HTTP_HEADERS, **cache.conditional_headers(url)}
+    with _http_get(url, headers, timeout) as resp:
+        if resp.status == 304 and cache is not None:
+            resp.read()
+            html = cache.load(url)
+        else:
+            charset = resp.headers.get_content_charset() or "utf-8"
+            html = resp.read().decode(charset, errors="replace")
+            if cache is not None:
+                cache.store(url, html, resp.getheader("ETag"),
+                            resp.getheader("Last-Modified"))
+            return html
+    if html is None:
+        # Cached body went missing; fetch unconditionally
+        return fetch_html(url, timeout)
+    return html
 
 
 def download_file(url: str, dest_path: str, timeout: int = 60) -> bool:
-    req = Request(url, headers={
-        "User-Agent": _HTTP_HEADERS["User-Agent"],
-    })
+    headers = {"User-Agent": _HTTP_HEADERS["User-Agent"]}
     try:
-        with urlopen(req, timeout=timeout) as resp:
+        with _http_get(url, headers, timeout) as resp:
             with open(dest_path, "wb") as f:
-                while True:
-                    chunk = resp.read(8192)
-                    if not chunk:
-                        break
-                    f.write(chunk)
+                shutil.copyfileobj(resp, f, length=1 << 20)
         return True
     except Exception as e:
-        print(f"  WARNING: Image download failed: {e}", file=sys.stderr)
+        print(f"  WARNING: Image download failed ({dest_path}): {e}",
+              file=sys.stderr)
         if os.path.exists(dest_path):
             os.remove(dest_path)
         return False
 
+
+def prefetch_html(pool: ThreadPoolExecutor, pending: dict[str, Future],
+                  urls, cache: PageCache | None = None) -> None:
+    """Submit fetch_html for each URL not already in flight."""
+    for url in urls:
+        if url and url not in pending:
+            pending[url] = pool.submit(fetch_html, url, cache=cache)
+
 # ---------------------------------------------------------------------------
 # SVT Play JSON extraction
 # ---------------------------------------------------------------------------
 
 
 def extract_page_json(html: str) -> dict | None:
-    match = re.search(INFO_SEARCH_EXPR, html)
-    if not match:
+    # Plain substring scan; a greedy regex over the whole page backtracks
+    start = html.find(NEXT_DATA_MARKER)
+    if start < 0:
+        return None
+    start = html.find(">", start) + 1
+    if start == 0:
+        return None
+    end = html.find("</script>", start)
+    if end < 0:
         return None
     try:
-        return json.loads(match.group(1))
+        return _json_loads(html[start:end])
     except json.JSONDecodeError:
         return None
 
 
-def _iter_urql_entries(page_json: dict):
+def _iter_urql_entries(page_json: dict, key_hint: str | None = None):
+    # key_hint skips entries whose raw JSON can't contain that key
     for entry in page_json.get("props", {}).get("urqlState", {}).values():
         if "data" in entry:
+            raw = entry["data"]
+            if key_hint and isinstance(raw, str) and key_hint not in raw:
+                continue
             try:
-                yield json.loads(entry["data"])
+                yield _json_loads(raw)
             except (json.JSONDecodeError, TypeError):
                 continue
 
@@ -129,7 +430,7 @@ def _iter_urql_entries(page_json: dict):
 
 
 def get_category_name(page_json: dict, url: str) -> str:
-    for entry in _iter_urql_entries(page_json):
+    for entry in _iter_urql_entries(page_json, "categoryPage"):
         for key, data in entry.items():
             if key == "categoryPage" and isinstance(data, dict):
                 for field in ("heading", "name"):
@@ -145,7 +446,7 @@ def get_category_name(page_json: dict, url: str) -> str:
 
 def get_category_items(page_json: dict) -> list[dict]:
     items: list[dict] = []
-    for entry in _iter_urql_entries(page_json):
+    for entry in _iter_urql_entries(page_json, "categoryPage"):
         for key, data in entry.items():
             if key != "categoryPage" or not isinstance(data, dict):
                 continue
@@ -165,13 +466,13 @@ def get_category_items(page_json: dict) -> list[dict]:
 
 def _find_details(page_json: dict) -> dict | None:
     # Prefer entries that have smartStart (like svtplay-dl does)
-    for entry in _iter_urql_entries(page_json):
+    for entry in _iter_urql_entries(page_json, "detailsPageByPath"):
         for key, data in entry.items():
             if (key == "detailsPageByPath"
                     and isinstance(data, dict)
                     and "smartStart" in data):
                 return data
-    for entry in _iter_urql_entries(page_json):
+    for entry in _iter_urql_entries(page_json, "detailsPageByPath"):
         for key, data in entry.items():
             if (key == "detailsPageByPath"
                     and isinstance(data, dict)
@@ -180,14 +481,18 @@ def _find_details(page_json: dict) -> dict | None:
     return None
 
 
-def get_video_metadata(html: str) -> tuple[str | None, str | None,
-                                            str | None]:
-    """Return (name, year, image_url) from a detail page."""
+def parse_detail(html: str) -> dict | None:
+    """Return the detailsPageByPath data of a detail page."""
     page_json = extract_page_json(html)
     if not page_json:
-        return None, None, None
+        return None
+    return _find_details(page_json)
+
 
-    details = _find_details(page_json)
+def get_video_metadata(details: dict | None,
+                       html: str) -> tuple[str | None, str | None,
+                                           str | None]:
+    """Return (name, year, image_url) from a parsed detail page."""
     if not details:
         return None, None, None
 
@@ -204,10 +509,11 @@ def get_video_metadata(html: str) -> tuple[str | None, str | None,
 
 
 def _safe_get(d, *keys):
-    for k in keys:
-        if not isinstance(d, dict):
-            return None
-        d = d.get(k)
+    try:
+        for k in keys:
+            d = d[k]
+    except (KeyError, TypeError):
+        return None
     return d
 
 
@@ -240,68 +546,56 @@ def _image_from_json(details: dict) -> str | None:
 # ---------------------------------------------------------------------------
 
 
-class _ImageSrcsetExtractor(HTMLParser):
-    def __init__(self):
-        super().__init__()
-        self._in_container = False
-        self.image_url: str | None = None
-
-    def handle_starttag(self, tag, attrs):
-        attr = dict(attrs)
-        if tag == "div" and attr.get("data-css-selector") == "imageContainer":
-            self._in_container = True
-        if tag == "img" and self._in_container and self.image_url is None:
-            srcset = attr.get("srcset", "")
-            if srcset:
-                best_url, best_w = None, 0
-                for part in srcset.split(","):
-                    part = part.strip()
-                    pieces = part.rsplit(" ", 1)
-                    if len(pieces) == 2:
-                        try:
-                            w = int(pieces[1].rstrip("w"))
-                        except ValueError:
-                            continue
-                        if w > best_w:
-                            best_w = w
-                            best_url = pieces[0]
-                self.image_url = best_url or attr.get("src")
-            else:
-                self.image_url = attr.get("src")
+_IMAGE_CONTAINER_MARKER = 'data-css-selector="imageContainer"'
+_IMAGE_SEARCH_WINDOW = 8192
+_IMG_TAG_RE = re.compile(r"<img\b[^>]*>")
+_IMG_ATTR_RE = re.compile(r'\s(srcset|src)="([^"]*)"')
+_SRCSET_PARTS_RE = re.compile(r"([^\s,]\S*)\s+(\d+)w")
+
 
-    def handle_endtag(self, tag):
-        if tag == "div":
-            self._in_container = False
+def _best_srcset_url(srcset: str) -> str | None:
+    best = max(_SRCSET_PARTS_RE.findall(srcset),
+               key=lambda c: int(c[1]), default=None)
+    return best[0] if best else None
 
 
 def _image_from_html(html: str) -> str | None:
-    p = _ImageSrcsetExtractor()
-    p.feed(html)
-    return p.image_url
+    # Only look at the first <img> before the container's first </div>
+    start = html.find(_IMAGE_CONTAINER_MARKER)
+    if start < 0:
+        return None
+    end = start + _IMAGE_SEARCH_WINDOW
+    div_end = html.find("</div>", start)
+    if div_end >= 0:
+        end = min(end, div_end)
+    tag = _IMG_TAG_RE.search(html, start, end)
+    if not tag:
+        return None
+    attr = {k: unescape(v) for k, v in _IMG_ATTR_RE.findall(tag.group(0))}
+    srcset = attr.get("srcset", "")
+    if srcset:
+        return _best_srcset_url(srcset) or attr.get("src")
+    return attr.get("src")
 
 # ---------------------------------------------------------------------------
 # Episode discovery (replaces svtplay-dl -A)
 # ---------------------------------------------------------------------------
 
 
-def discover_episode_urls(html: str) -> list[str]:
-    page_json = extract_page_json(html)
-    if not page_json:
-        return []
-
-    details = _find_details(page_json)
+def iter_episode_urls(details: dict | None):
+    """Yield the episode URLs of a parsed detail page, without duplicates."""
     if not details:
-        return []
+        return
 
-    # If this is a Single, return its own URL
+    # If this is a Single, yield its own URL
     parent_type = _safe_get(details, "item", "parent", "__typename")
     if parent_type == "Single":
         path = _safe_get(details, "item", "urls", "svtplay")
         if path:
-            return [urljoin("https://www.svtplay.se", path)]
-        return []
+            yield urljoin("https://www.svtplay.se", path)
+        return
 
-    videos: list[str] = []
+    seen_local: set[str] = set()
     for module in details.get("modules", []):
         mod_id = module.get("id", "")
         if mod_id in ("upcoming", "related") or mod_id.startswith("details"):
@@ -315,9 +609,24 @@ def discover_episode_urls(html: str) -> list[str]:
             path = _safe_get(item, "item", "urls", "svtplay")
             if path:
                 full = urljoin("https://www.svtplay.se", path)
-                if full not in videos:
-                    videos.append(full)
-    return videos
+                if full not in seen_local:
+                    seen_local.add(full)
+                    yield full
+
+
+def iter_new_episodes(details: dict | None, seen_episodes: set[str],
+                      permanent_urls: set[str], counts: dict):
+    """Yield episode URLs still to download.
+
+    counts["total"] and counts["permanent"] are updated as URLs are
+    scanned, so they are only complete once the generator is exhausted.
+    """
+    for ep in iter_episode_urls(details):
+        counts["total"] += 1
+        if ep in permanent_urls:
+            counts["permanent"] += 1
+        elif ep not in seen_episodes:
+            yield ep
 
 # ---------------------------------------------------------------------------
 # Tracking files (seen_urls.txt / seen_episodes.txt)
@@ -331,11 +640,46 @@ def load_seen(path: str) -> set[str]:
         return {line.strip() for line in f if line.strip()}
 
 
-def append_seen(path: str, url: str) -> None:
-    if not path:
-        return
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(url + "\n")
+class SeenLog:
+    """Append-only writer for a seen file, kept open for the whole run.
+
+    URLs are queued and written in batches of batch_size; flush() (also
+    done by close()) writes whatever is still pending.
+    """
+
+    def __init__(self, path: str, batch_size: int = 10):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending: list[str] = []
+        self._f = None
+
+    def add(self, url: str) -> None:
+        if not self.path:
+            return
+        self._pending.append(url + "\n")
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        if self._f is None:
+            self._f = open(self.path, "a", encoding="utf-8")
+        self._f.writelines(self._pending)
+        self._f.flush()
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
 
 
 def remove_from_seen(path: str, url: str) -> bool:
@@ -359,8 +703,8 @@ def load_json_state(path: str) -> dict:
     if not path or not os.path.exists(path):
         return {}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            return _json_loads(f.read())
     except (json.JSONDecodeError, OSError):
         return {}
 
@@ -369,21 +713,51 @@ def save_json_state(path: str, data: dict) -> None:
     if not path:
         return
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(tmp, "wb") as f:
+        f.write(_json_dumps(data))
     os.replace(tmp, path)
 
+
+class JsonState(dict):
+    """A JSON state file held in memory and written back lazily.
+
+    Changes are only marked dirty; the file is rewritten by maybe_flush()
+    at most every min_interval seconds, and by flush() at exit.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(load_json_state(path))
+        self.path = path
+        self.dirty = False
+        self.last_flush = time.monotonic()
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    def maybe_flush(self, min_interval: float = 5.0) -> None:
+        if (self.dirty
+                and time.monotonic() - self.last_flush >= min_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        if self.dirty:
+            save_json_state(self.path, self)
+            self.dirty = False
+        self.last_flush = time.monotonic()
+
 # ---------------------------------------------------------------------------
 # Error tracking
 # ---------------------------------------------------------------------------
 
 
+_NO_ERROR: dict = {}
+
+
 def is_permanent_error(errors: dict, url: str) -> bool:
-    return errors.get(url, {}).get("permanent", False)
+    return errors.get(url, _NO_ERROR).get("permanent", False)
 
 
-def record_error(errors: dict, url: str, return_code: int,
-                 errors_file: str) -> None:
+def record_error(errors: JsonState, url: str, return_code: int) -> None:
     entry = errors.get(url, {"fail_count": 0, "permanent": False})
     entry["fail_count"] = entry.get("fail_count", 0) + 1
     entry["last_error"] = f"svtplay-dl exited with code {return_code}"
@@ -391,15 +765,15 @@ def record_error(errors: dict, url: str, return_code: int,
     if entry["fail_count"] > 2:
         entry["permanent"] = True
     errors[url] = entry
-    save_json_state(errors_file, errors)
+    errors.mark_dirty()
 
 # ---------------------------------------------------------------------------
 # Series state
 # ---------------------------------------------------------------------------
 
 
-def update_series_state(state: dict, show_url: str, found_new: bool,
-                        show_name: str, state_file: str) -> None:
+def update_series_state(state: JsonState, show_url: str, found_new: bool,
+                        show_name: str) -> None:
     entry = state.get(show_url, {
         "name": show_name,
         "check_count": 0,
@@ -410,21 +784,27 @@ def update_series_state(state: dict, show_url: str, found_new: bool,
     if found_new:
         entry["check_count"] = 0
         entry["last_new_episode_date"] = datetime.now().isoformat()
+        entry["last_new_ts"] = int(time.time())
     else:
         entry["check_count"] = entry.get("check_count", 0) + 1
 
     state[show_url] = entry
-    save_json_state(state_file, state)
+    state.mark_dirty()
 
 
 def find_stale_series(state: dict, stale_days: int):
     now = datetime.now()
+    now_ts = int(time.time())
     for url, entry in state.items():
         checks = entry.get("check_count", 0)
         if checks < 2:
             continue
+        ts = entry.get("last_new_ts")
         raw = entry.get("last_new_episode_date")
-        if raw:
+        if isinstance(ts, int):
+            days = (now_ts - ts) // 86400
+        elif raw:
+            # Entries written before last_new_ts existed
             try:
                 days = (now - datetime.fromisoformat(raw)).days
             except ValueError:
@@ -439,9 +819,13 @@ def find_stale_series(state: dict, stale_days: int):
 # ---------------------------------------------------------------------------
 
 
-def run_svtplay_dl(url: str, output_dir: str, dry_run: bool) -> int:
+def run_svtplay_dl(url: str, output_dir: str, dry_run: bool,
+                   quiet: bool = False) -> int:
     global current_child
-    cmd = ["svtplay-dl", "-S", "-o", output_dir, url]
+    cmd = ["svtplay-dl", "-S"]
+    if quiet:
+        cmd.append("-s")
+    cmd += ["-o", output_dir, url]
     print(f"  >> {' '.join(cmd)}")
     if dry_run:
         return 0
@@ -457,29 +841,29 @@ def run_svtplay_dl(url: str, output_dir: str, dry_run: bool) -> int:
 
 
 def download_with_retry(url: str, output_dir: str, dry_run: bool,
-                        errors: dict, errors_file: str) -> bool:
+                        errors: JsonState, quiet: bool = False) -> bool:
     """Attempt download with one immediate retry. Returns True on success."""
     if is_permanent_error(errors, url):
         print(f"  SKIP (permanent error): {url} — see errors.json")
         return False
 
-    rc = run_svtplay_dl(url, output_dir, dry_run)
+    rc = run_svtplay_dl(url, output_dir, dry_run, quiet)
     if rc == 0:
         if url in errors:
             del errors[url]
-            save_json_state(errors_file, errors)
+            errors.mark_dirty()
         return True
 
     print(f"  Retrying {url} ...")
-    rc = run_svtplay_dl(url, output_dir, dry_run)
+    rc = run_svtplay_dl(url, output_dir, dry_run, quiet)
     if rc == 0:
         if url in errors:
             del errors[url]
-            save_json_state(errors_file, errors)
+            errors.mark_dirty()
         return True
 
-    record_error(errors, url, rc, errors_file)
-    entry = errors.get(url, {})
+    record_error(errors, url, rc)
+    entry = errors[url]
     if entry.get("permanent"):
         print(f"  PERMANENT ERROR: {url} "
               f"(failed {entry['fail_count']} times total)",
@@ -487,7 +871,7 @@ def download_with_retry(url: str, output_dir: str, dry_run: bool,
     else:
         print(f"  ERROR: {url} "
               f"(will retry next run, "
-              f"{entry.get('fail_count', 0)} failures total)",
+              f"{entry['fail_count']} failures total)",
               file=sys.stderr)
     return False
 
@@ -497,7 +881,7 @@ def download_with_retry(url: str, output_dir: str, dry_run: bool,
 
 
 def sanitize_filename(name: str) -> str:
-    name = re.sub(r'[<>:"/\\|?*]', "", name)
+    name = _SANITIZE_RE.sub("", name)
     return name.strip(". ")
 
 # ---------------------------------------------------------------------------
@@ -533,10 +917,19 @@ def main():
         "--errors-file", default="errors.json",
         help="Tracks download errors (default: %(default)s)",
     )
+    ap.add_argument(
+        "--cache-dir", default="detail_cache",
+        help="Caches detail pages between runs; empty string disables "
+             "(default: %(default)s)",
+    )
     ap.add_argument(
         "--sleep", type=float, default=1.0,
         help="Delay between downloads in seconds (default: %(default)s)",
     )
+    ap.add_argument(
+        "--fetch-workers", type=int, default=8, metavar="N",
+        help="Detail pages fetched ahead in parallel (default: %(default)s)",
+    )
     ap.add_argument(
         "--stale-days", type=int, default=365,
         help="Days w/o new episodes before suggesting completion "
@@ -550,6 +943,11 @@ def main():
         "--dry-run", action="store_true",
         help="Print commands without actually downloading",
     )
+    ap.add_argument(
+        "--quiet", action="store_true",
+        help="Run svtplay-dl with -s: no progress bar, only warnings "
+             "and errors",
+    )
     ap.add_argument(
         "--mark-complete", metavar="URL",
         help="Mark a series URL as complete and exit",
@@ -566,7 +964,8 @@ def main():
         if args.mark_complete in seen:
             print(f"Already marked as complete: {args.mark_complete}")
         else:
-            append_seen(args.seen_file, args.mark_complete)
+            with SeenLog(args.seen_file) as seen_log:
+                seen_log.add(args.mark_complete)
             print(f"Marked as complete: {args.mark_complete}")
         return
 
@@ -580,8 +979,22 @@ def main():
     # ---- load state ----
     seen = load_seen(args.seen_file)
     seen_episodes = load_seen(args.seen_episodes_file)
-    series_state = load_json_state(args.series_state_file)
-    errors = load_json_state(args.errors_file)
+    seen_log = SeenLog(args.seen_file)
+    seen_episodes_log = SeenLog(args.seen_episodes_file)
+    atexit.register(seen_log.close)
+    atexit.register(seen_episodes_log.close)
+    series_state = JsonState(args.series_state_file)
+    errors = JsonState(args.errors_file)
+    # Also covers the force-quit sys.exit() in the signal handler
+    atexit.register(series_state.flush)
+    atexit.register(errors.flush)
+    permanent_urls = {u for u, e in errors.items() if e.get("permanent")}
+    page_cache = None
+    if args.cache_dir:
+        if not args.dry_run:
+            os.makedirs(args.cache_dir, exist_ok=True)
+        page_cache = PageCache(args.cache_dir, read_only=args.dry_run)
+        atexit.register(page_cache.save)
 
     # ---- fetch category page ----
     print(f"Fetching category page: {args.url}")
@@ -623,12 +1036,34 @@ def main():
         total = stats["movies_downloaded"] + stats["episodes_downloaded"]
         return total >= args.max_dl
 
+    # Detail pages are fetched ahead of the (sequential) download loop
+    detail_urls: list[str | None] = []
+    for item_data in items:
+        try:
+            url = urljoin("https://www.svtplay.se",
+                          item_data["item"]["urls"]["svtplay"])
+        except (KeyError, TypeError):
+            url = None
+        detail_urls.append(url if url not in seen else None)
+
+    workers = max(1, args.fetch_workers)
+    fetch_pool = ThreadPoolExecutor(max_workers=workers)
+    pending_pages: dict[str, Future] = {}
+    # Posters are small and independent; download them in the background
+    poster_pool = ThreadPoolExecutor(max_workers=8)
+    posters_queued: set[str] = set()
+    background_pools.extend((fetch_pool, poster_pool))
+
+    scanned_all = True
     for idx, item_data in enumerate(items):
+        series_state.maybe_flush()
+        errors.maybe_flush()
         if stop_requested or dl_limit_reached():
             if dl_limit_reached():
                 print(f"\nReached --max-dl={args.max_dl}. Stopping.")
             else:
                 print("\nStopping as requested.")
+            scanned_all = False
             break
 
         try:
@@ -650,15 +1085,20 @@ def main():
             continue
 
         # ---- fetch detail page ----
+        prefetch_html(fetch_pool, pending_pages,
+                      detail_urls[idx:idx + 2 * workers], page_cache)
         print(f"  Fetching: {item_url}")
+        page = (pending_pages.pop(item_url, None)
+                or fetch_pool.submit(fetch_html, item_url, cache=page_cache))
         try:
-            detail_html = fetch_html(item_url)
+            detail_html = page.result()
         except Exception as e:
             print(f"  ERROR fetching detail page: {e}", file=sys.stderr)
             stats["errors_this_run"] += 1
             continue
 
-        name, year, image_url = get_video_metadata(detail_html)
+        details = parse_detail(detail_html)
+        name, year, image_url = get_video_metadata(details, detail_html)
         if not name:
             name = name_hint
 
@@ -673,77 +1113,99 @@ def main():
 
         # ---- poster image ----
         poster_path = os.path.join(folder_path, "poster.jpg")
-        if image_url and not os.path.exists(poster_path):
+        if (image_url and poster_path not in posters_queued
+                and not os.path.exists(poster_path)):
             print("  Downloading poster...")
+            posters_queued.add(poster_path)
             if args.dry_run:
                 print(f"  >> (dry-run) download poster -> {poster_path}")
             else:
-                download_file(image_url, poster_path)
+                poster_pool.submit(download_file, image_url, poster_path)
 
         # ---- download ----
         if is_single:
-            if is_permanent_error(errors, item_url):
+            if item_url in permanent_urls:
                 print(f"  SKIP (permanent error) — see errors.json")
                 stats["skipped_permanent"] += 1
                 continue
 
             if download_with_retry(item_url, folder_path, args.dry_run,
-                                   errors, args.errors_file):
+                                   errors, args.quiet):
                 if not args.dry_run:
-                    append_seen(args.seen_file, item_url)
+                    seen_log.add(item_url)
                 seen.add(item_url)
                 stats["movies_downloaded"] += 1
             else:
+                if is_permanent_error(errors, item_url):
+                    permanent_urls.add(item_url)
                 stats["errors_this_run"] += 1
 
         else:
             stats["series_checked"] += 1
-            episode_urls = discover_episode_urls(detail_html)
-            total_eps = len(episode_urls)
-
-            new_eps = [
-                ep for ep in episode_urls
-                if ep not in seen_episodes
-                and not is_permanent_error(errors, ep)
-            ]
-            perm_skipped = sum(
-                1 for ep in episode_urls
-                if is_permanent_error(errors, ep)
-            )
-            if perm_skipped:
-                stats["skipped_permanent"] += perm_skipped
-
-            print(f"  Episodes: {total_eps} total, {len(new_eps)} new"
-                  + (f", {perm_skipped} permanently failed"
-                     if perm_skipped else ""))
-
-            found_new = len(new_eps) > 0
-
+            counts = {"total": 0, "permanent": 0}
+            new_eps = iter_new_episodes(details, seen_episodes,
+                                        permanent_urls, counts)
+            # With --max-dl, episodes are scanned only as far as needed
+            lazy = args.max_dl > 0
+            if not lazy:
+                new_eps = list(new_eps)
+                print(f"  Episodes: {counts['total']} total, "
+                      f"{len(new_eps)} new"
+                      + (f", {counts['permanent']} permanently failed"
+                         if counts["permanent"] else ""))
+
+            found_new = False
+            hit_limit = False
             for ep_i, ep_url in enumerate(new_eps):
+                found_new = True
+                errors.maybe_flush()
                 if stop_requested or dl_limit_reached():
+                    hit_limit = dl_limit_reached()
                     break
-                print(f"  Episode [{ep_i + 1}/{len(new_eps)}]: {ep_url}")
+                if args.sleep > 0 and ep_i > 0:
+                    time.sleep(args.sleep)
+                    if stop_requested:
+                        break
+                of_total = "" if lazy else f"/{len(new_eps)}"
+                print(f"  Episode [{ep_i + 1}{of_total}]: {ep_url}")
                 if download_with_retry(ep_url, folder_path, args.dry_run,
-                                       errors, args.errors_file):
+                                       errors, args.quiet):
                     if not args.dry_run:
-                        append_seen(args.seen_episodes_file, ep_url)
+                        seen_episodes_log.add(ep_url)
                     seen_episodes.add(ep_url)
                     stats["episodes_downloaded"] += 1
                 else:
+                    if is_permanent_error(errors, ep_url):
+                        permanent_urls.add(ep_url)
                     stats["errors_this_run"] += 1
 
-                if (args.sleep > 0
-                        and ep_i < len(new_eps) - 1
-                        and not stop_requested):
-                    time.sleep(args.sleep)
+            if lazy:
+                print(f"  Episodes: {counts['total']} scanned"
+                      + (f", {counts['permanent']} permanently failed"
+                         if counts["permanent"] else "")
+                      + (" (scan stopped at --max-dl)"
+                         if hit_limit else ""))
+            if counts["permanent"]:
+                stats["skipped_permanent"] += counts["permanent"]
 
             if not args.dry_run:
-                update_series_state(series_state, item_url, found_new,
-                                    name, args.series_state_file)
+                update_series_state(series_state, item_url, found_new, name)
 
         if args.sleep > 0 and idx < len(items) - 1 and not stop_requested:
             time.sleep(args.sleep)
 
+    seen_log.close()
+    seen_episodes_log.close()
+    series_state.flush()
+    errors.flush()
+    fetch_pool.shutdown(wait=True, cancel_futures=True)
+    poster_pool.shutdown(wait=True)
+    close_connections()
+    if page_cache is not None:
+        # Untouched entries are only known to be gone after a full scan
+        page_cache.prune(drop_untouched=scanned_all)
+        page_cache.save()
+
     # ---- stale series suggestions ----
     stale = list(find_stale_series(series_state, args.stale_days))
     stale = [(u, n, d, c) for u, n, d, c in stale if u not in seen]